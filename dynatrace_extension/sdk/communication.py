@@ -15,6 +15,19 @@ from typing import Any, Generator, List, Sequence, TypeVar
 
 from .vendor.mureq.mureq import HTTPException, Response, request
 
+try:
+    # orjson is an optional, faster parser, we fall back to the standard library if it is not installed
+    import orjson
+
+    def json_loads(data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+
+    def json_loads(data: str | bytes) -> Any:
+        return json.loads(data)
+
+
 CONTENT_TYPE_JSON = "application/json;charset=utf-8"
 CONTENT_TYPE_PLAIN = "text/plain;charset=utf-8"
 COUNT_METRIC_ITEMS_DICT = TypeVar("COUNT_METRIC_ITEMS_DICT", str, List[str])
@@ -41,6 +54,8 @@ class StatusValue(Enum):
 
 
 class Status:
+    __slots__ = ("message", "status", "timestamp")
+
     def __init__(self, status: StatusValue = StatusValue.EMPTY, message: str = "", timestamp: int | None = None):
         self.status = status
         self.message = message
@@ -74,7 +89,6 @@ class MultiStatus:
 
         messages = []
         for stored_status in self.statuses:
-            print(stored_status)  # noqa: T201
             if stored_status.is_error():
                 ret.status = stored_status.status
             messages.append(stored_status.message)
@@ -281,7 +295,7 @@ class HttpClient(CommunicationClient):
         response = self._make_request(
             self._keep_alive_url, "POST", encoded_data, extra_headers={"Content-Type": CONTENT_TYPE_JSON}
         ).content
-        return json.loads(response.decode("utf-8"))
+        return json_loads(response)
 
     def send_keep_alive(self):
         return self.send_status(Status())
@@ -430,6 +444,7 @@ class DebugClient(CommunicationClient):
 
         batches = divide_into_batches(mint_lines, MAX_METRIC_REQUEST_SIZE)
         for batch in batches:
+            # The batch was encoded with json.dumps, orjson rejects some of what it writes (e.g. lone surrogates)
             lines = json.loads(batch)
             if self.local_ingest:
                 response = request(
@@ -503,7 +518,7 @@ def divide_into_batches(
     yield from divide_into_batches(second_half, max_size_bytes, join_with)
 
 
-@dataclass
+@dataclass(frozen=True)
 class MintResponse:
     lines_ok: int
     lines_invalid: int
@@ -8,10 +8,11 @@ import signal
 import sys
 import threading
 import time
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
 from itertools import chain
 from pathlib import Path
 from threading import Lock, RLock, active_count
@@ -93,6 +94,10 @@ class DtEventType(str, Enum):
     RESOURCE_CONTENTION_EVENT = "RESOURCE_CONTENTION_EVENT"
 
 
+# Built once so validating an event does not enumerate DtEventType for every key
+DT_EVENT_TYPES = tuple(DtEventType)
+
+
 class CountMetricRegistrationEntry(NamedTuple):
     metric_key: str
     aggregation_mode: AggregationMode
@@ -142,6 +147,37 @@ def _add_sfm_metric(metric: Metric, sfm_metrics: Optional[List[Metric]] = None):
     sfm_metrics.append(metric)
 
 
+@lru_cache(maxsize=1)
+def _parse_cli_args(argv: tuple) -> Namespace:
+    # The arguments do not change while the process runs, so sys.argv is only parsed once
+    parser = ArgumentParser(description="Python extension parameters")
+
+    # Production parameters, these are passed by the EEC
+    parser.add_argument("--dsid", required=False, default=None)
+    parser.add_argument("--url", required=False)
+    parser.add_argument("--idtoken", required=False)
+    parser.add_argument(
+        "--loglevel",
+        help="Set extension log level. Info is default.",
+        type=str,
+        choices=["debug", "info"],
+        default="info",
+    )
+    parser.add_argument("--fastcheck", action="store_true", default=False)
+    parser.add_argument("--monitoring_config_id", required=False, default=None)
+    parser.add_argument("--local-ingest", action="store_true", default=False)
+    parser.add_argument("--local-ingest-port", required=False, default=14499)
+
+    # Debug parameters, these are used when running the extension locally
+    parser.add_argument("--extensionconfig", required=False, default=None)
+    parser.add_argument("--activationconfig", required=False, default="activation.json")
+    parser.add_argument("--secrets", required=False, default="secrets.json")
+    parser.add_argument("--no-print-metrics", required=False, action="store_true")
+
+    args, unknown = parser.parse_known_args(list(argv))
+    return args
+
+
 class Extension:
     """Base class for Python extensions.
 
@@ -211,12 +247,13 @@ class Extension:
         self._scheduler = sched.scheduler(time.time, time.sleep)
 
         # Timestamps for scheduling of internal callbacks
+        now = datetime.now()
         self._next_internal_callbacks_timestamps: Dict[str, datetime] = {
-            "timediff": datetime.now() + TIME_DIFF_INTERVAL,
-            "heartbeat": datetime.now() + HEARTBEAT_INTERVAL,
-            "metrics": datetime.now() + METRIC_SENDING_INTERVAL,
-            "events": datetime.now() + METRIC_SENDING_INTERVAL,
-            "sfm_metrics": datetime.now() + SFM_METRIC_SENDING_INTERVAL,
+            "timediff": now + TIME_DIFF_INTERVAL,
+            "heartbeat": now + HEARTBEAT_INTERVAL,
+            "metrics": now + METRIC_SENDING_INTERVAL,
+            "events": now + METRIC_SENDING_INTERVAL,
+            "sfm_metrics": now + SFM_METRIC_SENDING_INTERVAL,
         }
 
         # Executors for the callbacks and internal methods
@@ -477,11 +514,9 @@ class Extension:
             metric_type: The type of the metric, defaults to MetricType.GAUGE
         """
 
-        if techrule:
-            if not dimensions:
-                dimensions = {}
-            if "dt.techrule.id" not in dimensions:
-                dimensions["dt.techrule.id"] = techrule
+        if techrule and (not dimensions or "dt.techrule.id" not in dimensions):
+            # Copy the dimensions, the caller may reuse the same dictionary for other metrics
+            dimensions = {**(dimensions or {}), "dt.techrule.id": techrule}
 
         if metric_type == MetricType.COUNT and timestamp is None:
             # We must report a timestamp for count metrics
@@ -632,7 +667,7 @@ class Extension:
             if DT_EVENT_SCHEMA[key] is None:
                 msg = f'invalid member: "{key}"'
                 raise ValueError(msg)
-            if key == "eventType" and value not in list(DtEventType):
+            if key == "eventType" and value not in DT_EVENT_TYPES:
                 msg = f"Event type must be a DtEventType enum value, got: {value}"
                 raise ValueError(msg)
             if key == "properties":
@@ -681,10 +716,11 @@ class Extension:
             Dictionary containing enabled feature sets with corresponding
             metrics defined in ``extension.yaml``.
         """
+        activated_feature_sets = {"default", *self.activation_config.feature_sets}
         return {
             feature_set_name: metric_keys
             for feature_set_name, metric_keys in self._feature_sets.items()
-            if feature_set_name in self.activation_config.feature_sets or feature_set_name == "default"
+            if feature_set_name in activated_feature_sets
         }
 
     @property
@@ -706,31 +742,7 @@ class Extension:
         return list(chain(*self.enabled_feature_sets.values()))
 
     def _parse_args(self):
-        parser = ArgumentParser(description="Python extension parameters")
-
-        # Production parameters, these are passed by the EEC
-        parser.add_argument("--dsid", required=False, default=None)
-        parser.add_argument("--url", required=False)
-        parser.add_argument("--idtoken", required=False)
-        parser.add_argument(
-            "--loglevel",
-            help="Set extension log level. Info is default.",
-            type=str,
-            choices=["debug", "info"],
-            default="info",
-        )
-        parser.add_argument("--fastcheck", action="store_true", default=False)
-        parser.add_argument("--monitoring_config_id", required=False, default=None)
-        parser.add_argument("--local-ingest", action="store_true", default=False)
-        parser.add_argument("--local-ingest-port", required=False, default=14499)
-
-        # Debug parameters, these are used when running the extension locally
-        parser.add_argument("--extensionconfig", required=False, default=None)
-        parser.add_argument("--activationconfig", required=False, default="activation.json")
-        parser.add_argument("--secrets", required=False, default="secrets.json")
-        parser.add_argument("--no-print-metrics", required=False, action="store_true")
-
-        args, unknown = parser.parse_known_args()
+        args = _parse_cli_args(tuple(sys.argv[1:]))
         self._is_fastcheck = args.fastcheck
         if args.dsid is None:
             # DEV mode
@@ -991,12 +1003,13 @@ class Extension:
                 return overall_status
 
         for callback in self._scheduled_callbacks:
-            if callback.status.is_error():
-                overall_status.status = callback.status.status
-                messages.append(f"{callback}: {callback.status.message}")
-                continue
-            if callback.status.message is not None and callback.status.message != "":
-                messages.append(f"{callback}: {callback.status.message}")
+            # Read the status once, the callback may replace it from its own thread in the meantime
+            status = callback.status
+            if status.is_error():
+                overall_status.status = status.status
+                messages.append(f"{callback}: {status.message}")
+            elif status.message:
+                messages.append(f"{callback}: {status.message}")
         overall_status.message = "\n".join(messages)
         return overall_status
 
@@ -13,6 +13,9 @@ LIMIT_LINE_LENGTH = 2000
 CLIENT_FACING_SFM_NAMESPACE = "dsfm"
 INTERNAL_SFM_NAMESPACE = "isfm"
 
+CLIENT_FACING_SFM_PREFIX = f"{CLIENT_FACING_SFM_NAMESPACE}:datasource.python."
+INTERNAL_SFM_PREFIX = f"{INTERNAL_SFM_NAMESPACE}:datasource.python."
+
 
 class SummaryStat:
     def __init__(
@@ -38,6 +41,8 @@ class MetricType(Enum):
 
 
 class Metric:
+    __slots__ = ("dimensions", "key", "metric_type", "timestamp", "value")
+
     def __init__(
         self,
         key: str,
@@ -61,21 +66,10 @@ class Metric:
         return self._key_and_dimensions() == other._key_and_dimensions()
 
     def to_mint_line(self) -> str:
-        # Add key and dimensions
-        line = f"{self._key_and_dimensions()}"
-
-        # Add value
-        if self.metric_type == MetricType.DELTA:
-            line = f"{line} {self.metric_type.value}={self.value}"
-        else:
-            line = f"{line} {self.metric_type.value},{self.value}"
-
-        # Add timestamp
-        if self.timestamp is not None:
-            timestamp = int(self.timestamp.timestamp() * 1000)
-            line = f"{line} {timestamp}"
-
-        return line
+        # Delta values follow the type with "=" (count,delta=1), the other types use "," (gauge,1)
+        value_separator = "=" if self.metric_type == MetricType.DELTA else ","
+        timestamp = "" if self.timestamp is None else f" {int(self.timestamp.timestamp() * 1000)}"
+        return f"{self._key_and_dimensions()} {self.metric_type.value}{value_separator}{self.value}{timestamp}"
 
     def __repr__(self):
         return self.to_mint_line()
@@ -100,6 +94,8 @@ class Metric:
 
 
 class SfmMetric(Metric):
+    __slots__ = ()
+
     def __init__(
         self,
         key: str,
@@ -114,5 +110,5 @@ class SfmMetric(Metric):
 
 
 def create_sfm_metric_key(key: str, client_facing: bool = False) -> str:
-    namespace = CLIENT_FACING_SFM_NAMESPACE if client_facing else INTERNAL_SFM_NAMESPACE
-    return f"{namespace}:datasource.python.{key}"
+    prefix = CLIENT_FACING_SFM_PREFIX if client_facing else INTERNAL_SFM_PREFIX
+    return f"{prefix}{key}"
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from types import MappingProxyType
 from typing import ClassVar, List, NamedTuple
 
 
@@ -13,7 +14,7 @@ class DefaultLogLevel(NamedTuple):
 
 class RuntimeProperties:
     _default_log_level = DefaultLogLevel("info", logging.INFO)
-    _log_level_converter: ClassVar = {"debug": logging.DEBUG, "info": logging.INFO}
+    _log_level_converter: ClassVar = MappingProxyType({"debug": logging.DEBUG, "info": logging.INFO})
 
     def __init__(self, json_response: dict):
         """
@@ -64,4 +65,3 @@ class RuntimeProperties:
         value = self.runtime.get("debuglevel.api", RuntimeProperties._default_log_level.string_value)
         value = self.runtime.get(f"debuglevel.{extension_name}.api", value)
         return RuntimeProperties._to_log_level(value)
-        pass
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from .communication import json_loads
+
 PREFIX_HOST = "HOST"
 PREFIX_PG = "PROCESS_GROUP"
 PREFIX_PGI = "PROCESS_GROUP_INSTANCE"
 
 
-@dataclass
+@dataclass(slots=True)
 class EntryProperties:
     technologies: list[str]
     pg_technologies: list[str]
@@ -22,7 +23,7 @@ class EntryProperties:
         return EntryProperties(technologies, pg_technologies)
 
 
-@dataclass
+@dataclass(slots=True)
 class PortBinding:
     ip: str
     port: int
@@ -33,7 +34,7 @@ class PortBinding:
         return PortBinding(ip, int(port))
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessProperties:
     cmd_line: str | None
     exe_path: str | None
@@ -69,7 +70,7 @@ class ProcessProperties:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Process:
     pid: int
     process_name: str
@@ -86,7 +87,7 @@ class Process:
         return Process(pid, process_name, properties)
 
 
-@dataclass
+@dataclass(slots=True)
 class Entry:
     group_id: str
     node_id: str
@@ -124,20 +125,22 @@ class Entry:
         return Entry(group_id, node_id, group_instance_id, process_type, group_name, processes, properties)
 
 
-@dataclass
+@dataclass(slots=True)
 class Snapshot:
     host_id: str
     entries: list[Entry]
 
     @staticmethod
     def parse_from_file(snapshot_file: Path | str | None = None) -> Snapshot:
-        """Returns a process snapshot object like EF1.0 used to do"""
+        """Returns a process snapshot object like EF1.0 used to do
+
+        The snapshot file is only read again when it changes, every call returns a new object.
+        """
 
         if snapshot_file is None:
             snapshot_file = find_log_dir() / "plugin" / "oneagent_latest_snapshot.log"
 
-        with open(snapshot_file) as f:
-            snapshot_json = json.load(f)
+        snapshot_json = _read_snapshot_file(str(snapshot_file))
 
         host_id = snapshot_json.get("host_id", "0X0000000000000000")
         host_id = f"{PREFIX_HOST}-{host_id[-16:]}"
@@ -154,6 +157,23 @@ class Snapshot:
         return pgs
 
 
+# Latest decoded contents of each snapshot file, with the modification time and size they were read at
+_snapshot_files: dict[str, tuple[int, int, dict]] = {}
+
+
+def _read_snapshot_file(snapshot_file: str) -> dict:
+    # A rewritten snapshot is read again and replaces the old contents, only one is kept per file.
+    # The returned dict is shared between calls and is only read when building the snapshot objects
+    stat = os.stat(snapshot_file)
+    cached = _snapshot_files.get(snapshot_file)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    snapshot_json = json_loads(Path(snapshot_file).read_bytes())
+    _snapshot_files[snapshot_file] = (stat.st_mtime_ns, stat.st_size, snapshot_json)
+    return snapshot_json
+
+
 def find_config_directory() -> Path:
     """
     Attempt to find the OneAgent config directory.
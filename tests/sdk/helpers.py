@@ -0,0 +1,31 @@
+import threading
+from typing import Optional
+
+from dynatrace_extension.sdk.extension import Extension
+
+
+class CallbackTracker:
+    """Count the scheduled callbacks the extension finished running, so tests can wait for them instead of sleeping.
+
+    If name is given, only callbacks with that name are counted.
+    """
+
+    def __init__(self, extension: Extension, name: Optional[str] = None):
+        self.count = 0
+        self._name = name
+        self._condition = threading.Condition()
+        self._run_callback = extension._run_callback
+        extension._run_callback = self._track  # type: ignore
+
+    def _track(self, callback):
+        try:
+            self._run_callback(callback)
+        finally:
+            if self._name is None or callback.name() == self._name:
+                with self._condition:
+                    self.count += 1
+                    self._condition.notify_all()
+
+    def wait_for(self, count: int, timeout: float = 5) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: self.count >= count, timeout)
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, mock_open, patch
 from dynatrace_extension.sdk.communication import (
     MAX_LOG_REQUEST_SIZE,
     MAX_METRIC_REQUEST_SIZE,
+    DebugClient,
     HttpClient,
     divide_into_batches,
 )
@@ -27,6 +28,12 @@ class TestCommunication(unittest.TestCase):
         responses = http_client.send_metrics(no_metrics)
         self.assertEqual(len(responses), 0)
 
+    def test_debug_client_metric_with_lone_surrogate(self):
+        debug_client = DebugClient("", "", MagicMock())
+        # json.dumps escapes the surrogate when batching, the batch must still be read back
+        responses = debug_client.send_metrics(['my.metric,dim="\udc80" 10'])
+        self.assertEqual(responses, [])
+
     def test_large_log_chunk(self):
 
         # This is 14_660_000 bytes
@@ -1,6 +1,7 @@
-import threading
+import re
 import time
 import unittest
+from concurrent.futures import Executor, Future
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, mock_open, patch
 
@@ -15,6 +16,66 @@ from dynatrace_extension.sdk.extension import (
     Extension,
 )
 from dynatrace_extension.sdk.helper import _HelperExtension, dt_fastcheck, schedule_function, schedule_method
+from tests.sdk.helpers import CallbackTracker
+
+DT_EVENT = {
+    "eventType": "CUSTOM_INFO",
+    "title": "test_event",
+    "startTime": 123456789,
+    "endTime": 123456789,
+    "timeout": 5,
+    "entitySelector": 'type("value")',
+    "properties": {"prop1": "val1"},
+}
+INVALID_DT_EVENT = {**DT_EVENT, "eventType": 134814814, "properties": {"prop1": 1}}
+ACTIVATION_CONFIG = ActivationConfig({"pythonRemote": "config"})
+ONE_INVALID_LINE = MintResponse(lines_invalid=1, lines_ok=0, error=None, warnings=None)
+TWO_INVALID_LINES = MintResponse(lines_invalid=2, lines_ok=0, error=None, warnings=None)
+
+# Metric key and the value after the last separator, e.g. "...count,delta=1" or "...gauge,0.0100"
+SFM_LINE = re.compile(r"^([^,]+),.*[,=]([^,=]+)$", re.MULTILINE)
+
+
+def sim_extension(extension: Extension) -> Extension:
+    """Prepare an extension the way most tests need it: running in the simulator with a mocked logger and client."""
+    extension.logger = MagicMock()
+    extension._running_in_sim = True
+    extension._is_fastcheck = False
+    extension._client = MagicMock()
+    return extension
+
+
+class SchedulerClock:
+    """Scheduler time function that tests can move forward instead of waiting in real time."""
+
+    def __init__(self, extension: Extension):
+        self.offset = 0.0
+        extension._scheduler.timefunc = self.time
+
+    def time(self) -> float:
+        return time.time() + self.offset
+
+    def shift(self, delta: timedelta) -> None:
+        self.offset += delta.total_seconds()
+
+
+class InlineExecutor(Executor):
+    """Executor that runs the submitted work right away in the calling thread."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def run_inline(extension: Extension) -> None:
+    """Make the extension run its callbacks and internal work in the calling thread."""
+    extension._callbacks_executor = InlineExecutor()  # type: ignore
+    extension._internal_executor = InlineExecutor()  # type: ignore
+    extension._heartbeat_executor = InlineExecutor()  # type: ignore
 
 
 class TestExtension(unittest.TestCase):
@@ -22,14 +83,15 @@ class TestExtension(unittest.TestCase):
         Extension._instance = None
         Extension.schedule_decorators = []
 
-    @patch("dynatrace_extension.Extension._heartbeat")
-    def test_heartbeat_called(self, mock_extension):
+    def test_heartbeat_called(self):
         extension = Extension()
+        extension._heartbeat = MagicMock()
         extension.logger = MagicMock()
         extension._running_in_sim = True
         extension._next_heartbeat = datetime.now()
+        run_inline(extension)
         extension._heartbeat_iteration()
-        extension._heartbeat.assert_called()
+        extension._heartbeat.assert_called_once()
 
     def test_loglevel(self):
         pass
@@ -48,6 +110,15 @@ class TestExtension(unittest.TestCase):
         self.assertEqual(len(extension._metrics), 1)
         self.assertTrue(extension._metrics[0].startswith("my_metric gauge,1"))
 
+    def test_add_metric_techrule(self):
+        extension = Extension()
+        extension.logger = MagicMock()
+        extension._running_in_sim = True
+        dimensions = {"dim": "value"}
+        extension.report_metric("my_metric", 1, dimensions, techrule="my_techrule")
+        self.assertTrue(extension._metrics[0].startswith('my_metric,dim="value",dt.techrule.id="my_techrule" gauge,1'))
+        self.assertEqual(dimensions, {"dim": "value"})
+
     def test_metrics_flushed(self):
         extension = Extension()
         extension._running_in_sim = True
@@ -55,10 +126,9 @@ class TestExtension(unittest.TestCase):
         extension.report_metric("my_metric", 1)
 
         self.assertEqual(len(extension._metrics), 1)
+        run_inline(extension)
         extension._metrics_iteration()
-        time.sleep(0.01)
-        with extension._metrics_lock:
-            self.assertEqual(len(extension._metrics), 0)
+        self.assertEqual(len(extension._metrics), 0)
 
     def test_add_event(self):
         extension = Extension()
@@ -99,17 +169,12 @@ class TestExtension(unittest.TestCase):
         extension.report_event("my_event1", "my_description")
         extension.report_event("my_event1", "my_description")
         self.assertEqual(len(extension._logs), 2)
+        run_inline(extension)
         extension._events_iteration()
-        time.sleep(0.01)
-        with extension._logs_lock:
-            self.assertEqual(len(extension._logs), 0)
+        self.assertEqual(len(extension._logs), 0)
 
     def test_callback(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(Extension())
         extension._run_callback = MagicMock()
 
         def callback():
@@ -121,16 +186,12 @@ class TestExtension(unittest.TestCase):
 
         extension.schedule(callback, timedelta(seconds=1))
         self.assertEqual(len(extension._scheduled_callbacks), 3)
+        run_inline(extension)
         extension._scheduler.run(blocking=False)
-        time.sleep(0.01)
         self.assertEqual(extension._run_callback.call_count, 3)
 
     def test_callback_scheduled_multiple_times(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(Extension())
 
         callback_call_count = 0
 
@@ -138,31 +199,29 @@ class TestExtension(unittest.TestCase):
             nonlocal callback_call_count
             callback_call_count += 1
 
+        callbacks = CallbackTracker(extension, "callback")
         extension.schedule(callback, timedelta(seconds=1))
         extension.schedule(callback, timedelta(seconds=1))
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(2))
 
         self.assertEqual(extension._scheduled_callbacks[0].executions_total, 1)
         self.assertEqual(extension._scheduled_callbacks[1].executions_total, 1)
         self.assertEqual(callback_call_count, 2)
 
     def test_big_number_callbacks_scheduled(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(Extension())
+
+        def callback(index):
+            extension.report_metric("scheduled_callback_executed", 1, {"index": f"{index}"})
 
+        callbacks = CallbackTracker(extension, "callback")
         for i in range(200):
-            extension.schedule(
-                callback=lambda x: extension.report_metric("scheduled_callback_executed", 1, {"index": f"{x}"}),
-                interval=timedelta(seconds=10),
-                args=(i,),
-            )
+            extension.schedule(callback=callback, interval=timedelta(seconds=10), args=(i,))
         # run scheduler once and flush metrics
         extension._scheduler.run(blocking=False)
-        time.sleep(0.1)
+        self.assertTrue(callbacks.wait_for(200))
+        self.assertEqual(len(extension._metrics), 200)
         extension._metrics_iteration()
 
     def test_callback_from_init(self):
@@ -174,14 +233,11 @@ class TestExtension(unittest.TestCase):
                 self.callback_call_count = 0
                 self.schedule(self.callback, timedelta(seconds=1))
 
-        extension = MyExt()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(MyExt())
 
+        callbacks = CallbackTracker(extension, "callback")
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(1))
 
         self.assertEqual(len(extension._scheduled_callbacks), 2)
         self.assertEqual(extension._scheduled_callbacks[0].executions_total, 1)
@@ -205,23 +261,22 @@ class TestExtension(unittest.TestCase):
             def another_callback(self):
                 self.another_callback_call_count += 1
 
-        extension = MyExt()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(MyExt())
 
+        clock = SchedulerClock(extension)
+        callbacks = CallbackTracker(extension, "callback_that_schedules_another_callback")
         extension.schedule(extension.callback_that_schedules_another_callback, timedelta(seconds=1))
         self.assertEqual(len(extension._scheduled_callbacks), 2)
 
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(1))
 
         self.assertEqual(len(extension._scheduled_callbacks), 3)
         self.assertEqual(extension._scheduled_callbacks[1].executions_total, 1)
         self.assertEqual(extension.callback_that_schedules_another_callback_call_count, 1)
+        clock.shift(timedelta(seconds=1))
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(2))
 
         self.assertEqual(len(extension._scheduled_callbacks), 3)
         self.assertEqual(extension._scheduled_callbacks[1].executions_total, 2)
@@ -229,44 +284,29 @@ class TestExtension(unittest.TestCase):
         self.assertGreaterEqual(extension._scheduled_callbacks[1].executions_total, 1)
         self.assertGreaterEqual(extension.callback_that_schedules_another_callback_call_count, 1)
 
+        clock.shift(timedelta(seconds=1))
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
         assert len(extension._scheduled_callbacks) == 3
 
     def test_callback_scheduled_exception(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(Extension())
+        clock = SchedulerClock(extension)
+        callbacks = CallbackTracker(extension, "callback")
         callback_call_count = 0
-        callback_wait = threading.Condition()
-        callback_wait.acquire()
 
         def callback():
-            nonlocal callback_call_count, callback_wait
+            nonlocal callback_call_count
             callback_call_count += 1
-            if callback_call_count == 2:
-                with callback_wait:
-                    callback_wait.notify()
-
             msg = "test exception"
             raise RuntimeError(msg)
 
-        def run_scheduler():
-            nonlocal extension, callback, callback_wait, callback_call_count
-            extension.schedule(callback, timedelta(seconds=1))
-            extension._scheduler.run(blocking=False)
-            time.sleep(1)
-            extension._scheduler.run(blocking=False)
-            time.sleep(1)
-            if callback_call_count < 2:
-                callback_wait.notify()
-
-        with callback_wait:
-            t = threading.Thread(target=run_scheduler)
-            t.start()
-            callback_wait.wait(timeout=5)
+        extension.schedule(callback, timedelta(seconds=1))
+        extension._scheduler.run(blocking=False)
+        self.assertTrue(callbacks.wait_for(1))
+
+        clock.shift(timedelta(seconds=1))
+        extension._scheduler.run(blocking=False)
+        self.assertTrue(callbacks.wait_for(2))
         self.assertEqual(callback_call_count, 2)
 
     def test_schedule_method_decorator(self):
@@ -281,8 +321,8 @@ class TestExtension(unittest.TestCase):
 
         extension = MyExt()
 
+        run_inline(extension)
         extension._scheduler.run(blocking=False)
-        time.sleep(0.01)
 
         self.assertEqual(len(extension._scheduled_callbacks), 2)
         self.assertTrue(extension.called_callback)
@@ -296,18 +336,15 @@ class TestExtension(unittest.TestCase):
             callback_done = True
 
         extension = _HelperExtension()
+        callbacks = CallbackTracker(extension, "callback")
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(1))
 
         self.assertEqual(len(extension._scheduled_callbacks), 1)
         self.assertTrue(callback_done)
 
     def test_query_status(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(Extension())
         callback_call_count = 0
 
         def callback():
@@ -317,19 +354,22 @@ class TestExtension(unittest.TestCase):
                 msg = "test exception"
                 raise RuntimeError(msg)
 
+        clock = SchedulerClock(extension)
+        callbacks = CallbackTracker(extension, "callback")
         extension.schedule(callback, timedelta(seconds=1))
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(1))
         self.assertEqual(extension._build_current_status().status, StatusValue.GENERIC_ERROR)
+        clock.shift(timedelta(seconds=1))
         extension._scheduler.run(blocking=False)
-        time.sleep(1)
+        self.assertTrue(callbacks.wait_for(2))
         self.assertEqual(extension._build_current_status().status, StatusValue.OK)
 
     def test_register_fastcheck(self):
         extension = Extension()
         extension.logger = MagicMock()
         extension._client = MagicMock()
-        extension.activation_config = ActivationConfig({"pythonRemote": "config"})
+        extension.activation_config = ACTIVATION_CONFIG
         extension.extension_config = "extension_config"
 
         fastcheck = MagicMock()
@@ -343,7 +383,7 @@ class TestExtension(unittest.TestCase):
     def test_register_fastcheck_decorator(self):
         extension = Extension()
         extension._client = MagicMock()
-        extension.activation_config = ActivationConfig({"pythonRemote": "config"})
+        extension.activation_config = ACTIVATION_CONFIG
         extension.extension_config = "extension_config"
 
         @dt_fastcheck()
@@ -366,49 +406,38 @@ class TestExtension(unittest.TestCase):
         extension = MyExt()
         extension.logger = MagicMock()
         extension._client = MagicMock()
-        extension.activation_config = ActivationConfig({"pythonRemote": "config"})
+        extension.activation_config = ACTIVATION_CONFIG
         extension.extension_config = "extension_config"
         extension._run_fastcheck()
 
         extension.fastcheck_mock.assert_called_once_with(extension.activation_config, "extension_config")
         extension._client.send_status.assert_called_once_with(extension.fastcheck_mock.return_value)
 
-    def test_fastcheck_exception(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._client = MagicMock()
-
-        fastcheck = MagicMock()
-        fastcheck.side_effect = Exception("SomeException")
-        extension.register_fastcheck(fastcheck)
-        self.assertRaises(Exception, extension._run_fastcheck)
-
-        fastcheck.assert_called_once()
-        extension._client.send_status.assert_called_once()
-        self.assertEqual(extension._client.send_status.call_args[0][0].status, StatusValue.GENERIC_ERROR)
-        self.assertIn(
-            "Python datasource fastcheck error: Exception('SomeException')",
-            extension._client.send_status.call_args[0][0].message,
-        )
-
-    def test_fastcheck_python_error(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._client = MagicMock()
-
-        def custom_fastcheck(activation_config) -> Status:
+    def test_fastcheck_error(self):
+        def wrong_signature_fastcheck(activation_config) -> Status:
             return Status(StatusValue.OK)
 
-        extension.register_fastcheck(custom_fastcheck)
-        self.assertRaises(TypeError, extension._run_fastcheck)
+        failing_fastcheck = MagicMock(side_effect=Exception("SomeException"))
+        cases = [
+            (failing_fastcheck, Exception, "Python datasource fastcheck error: Exception('SomeException')"),
+            (wrong_signature_fastcheck, TypeError, "Python datasource fastcheck error: TypeError"),
+        ]
 
-        extension._client.send_status.assert_called_once()
-        self.assertEqual(extension._client.send_status.call_args[0][0].status, StatusValue.GENERIC_ERROR)
-        self.assertTrue(
-            extension._client.send_status.call_args[0][0].message.startswith(
-                "Python datasource fastcheck error: TypeError"
-            )
-        )
+        for fastcheck, exception, message in cases:
+            with self.subTest(fastcheck=fastcheck):
+                # A new extension per row, registering a second fastcheck on one extension logs an error
+                Extension._instance = None
+                extension = Extension()
+                extension.logger = MagicMock()
+                extension._client = MagicMock()
+                extension.register_fastcheck(fastcheck)
+                self.assertRaises(exception, extension._run_fastcheck)
+
+                extension._client.send_status.assert_called_once()
+                status = extension._client.send_status.call_args[0][0]
+                self.assertEqual(status.status, StatusValue.GENERIC_ERROR)
+                self.assertTrue(status.message.startswith(message))
+        failing_fastcheck.assert_called_once()
 
     def test_fastcheck_more_than_one_assigned(self):
         extension = Extension()
@@ -441,10 +470,13 @@ class TestExtension(unittest.TestCase):
 
     @patch("sys.argv", ["dummy_exe", "--dsid", "test_id"])
     @patch("builtins.open", mock_open(read_data="test_token"))
-    @patch.object(HttpClient, "get_activation_config", return_value={})
-    @patch.object(HttpClient, "get_extension_config", return_value="")
-    @patch.object(HttpClient, "get_feature_sets", return_value={})
-    def test_arguments(self, activation_mock, extension_mock, feature_sets_mock):
+    @patch.multiple(
+        HttpClient,
+        get_activation_config=MagicMock(return_value={}),
+        get_extension_config=MagicMock(return_value=""),
+        get_feature_sets=MagicMock(return_value={}),
+    )
+    def test_arguments(self):
         ext = Extension()
         self.assertEqual(ext.task_id, "test_id")
         self.assertEqual(ext.activation_config, ActivationConfig({}))
@@ -456,127 +488,57 @@ class TestExtension(unittest.TestCase):
         self.assertEqual(ext.task_id, "development_task_id")
         self.assertEqual(ext.monitoring_config_id, "development_config_id")
 
-    def parse_sfm(self, line):
-        tokens = line.split(",")
-        name = tokens[0]
-        last_token = tokens[-1]
-        tokens = last_token.split("=")
-        value = tokens[-1]
-        return (name, value)
-
     def verify_sfm_value(self, sfm, expected_values):
-        found = False
-        for line in sfm:
-            name, value = self.parse_sfm(line)
+        values = dict(SFM_LINE.findall("\n".join(sfm)))
+        self.assertEqual(values.keys(), expected_values.keys())
+        for name, expected in expected_values.items():
             if name == "dsfm:datasource.python.threads":
-                self.assertIsNotNone(expected_values.get(name))
-                found = True
+                # The thread count depends on the executors of the whole test run
+                continue
             if name == "dsfm:datasource.python.execution.time":
-                self.assertAlmostEqual(float(value), expected_values[name], delta=0.1)
-                found = True
-            if name == "dsfm:datasource.python.execution.total.count":
-                self.assertEqual(int(value), expected_values[name])
-                found = True
-            if name == "dsfm:datasource.python.execution.count":
-                self.assertEqual(int(value), expected_values[name])
-                found = True
-            if name == "dsfm:datasource.python.execution.ok.count":
-                self.assertEqual(int(value), expected_values[name])
-                found = True
-            if name == "dsfm:datasource.python.execution.timeout.count":
-                self.assertEqual(int(value), expected_values[name])
-                found = True
-            if name == "dsfm:datasource.python.execution.exception.count":
-                self.assertEqual(int(value), expected_values[name])
-                found = True
-            self.assertTrue(found, f"No SFM metrics found: {line}")
-
-    def test_sfm_ok(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+                self.assertAlmostEqual(float(values[name]), expected, delta=0.1)
+            else:
+                self.assertEqual(int(values[name]), expected, name)
 
-        # extension._run_callback = MagicMock()
-
-        def callback():
-            time.sleep(0.01)
+    def test_sfm(self):
+        def ok_callback():
             return 1
 
-        extension.schedule(callback, timedelta(seconds=1))
-        extension._scheduler.run(blocking=False)
-        time.sleep(0.1)
-        sfm = extension._prepare_sfm_metrics()
-        expected_values = {
-            "dsfm:datasource.python.threads": 0,
-            "dsfm:datasource.python.execution.time": 0.01,
-            "dsfm:datasource.python.execution.total.count": 1,
-            "dsfm:datasource.python.execution.count": 1,
-            "dsfm:datasource.python.execution.ok.count": 1,
-            "dsfm:datasource.python.execution.timeout.count": 0,
-            "dsfm:datasource.python.execution.exception.count": 0,
-        }
-        self.verify_sfm_value(sfm, expected_values)
-
-    def test_sfm_timeout(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
-
-        def callback():
-            time.sleep(1.1)
-            return 1
-
-        extension.schedule(callback, timedelta(seconds=1))
-        extension._scheduler.run(blocking=False)
-        time.sleep(2)
-        sfm = extension._prepare_sfm_metrics()
-        expected_values = {
-            "dsfm:datasource.python.threads": 0,
-            "dsfm:datasource.python.execution.time": 1.1,
-            "dsfm:datasource.python.execution.total.count": 1,
-            "dsfm:datasource.python.execution.count": 1,
-            "dsfm:datasource.python.execution.ok.count": 0,
-            "dsfm:datasource.python.execution.timeout.count": 1,
-            "dsfm:datasource.python.execution.exception.count": 0,
-        }
-        self.verify_sfm_value(sfm, expected_values)
-
-    def test_sfm_exception(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
-
-        def callback():
+        def exception_callback():
             msg = "Ups ..."
             raise Exception(msg)
 
-        extension.schedule(callback, timedelta(seconds=1))
-        extension._scheduler.run(blocking=False)
-        time.sleep(1)
-        sfm = extension._prepare_sfm_metrics()
-        expected_values = {
-            "dsfm:datasource.python.threads": 0,
-            "dsfm:datasource.python.execution.time": 0.1,
-            "dsfm:datasource.python.execution.total.count": 1,
-            "dsfm:datasource.python.execution.count": 1,
-            "dsfm:datasource.python.execution.ok.count": 0,
-            "dsfm:datasource.python.execution.timeout.count": 0,
-            "dsfm:datasource.python.execution.exception.count": 1,
-        }
-        self.verify_sfm_value(sfm, expected_values)
+        # The callback timer is patched to report the duration, a callback taking longer than the interval times out
+        cases = [
+            # callback, duration, ok count, timeout count, exception count
+            (ok_callback, 0.01, 1, 0, 0),
+            (ok_callback, 1.1, 0, 1, 0),
+            (exception_callback, 0.01, 0, 0, 1),
+        ]
+        for callback, duration, ok_count, timeout_count, exception_count in cases:
+            with self.subTest(callback=callback.__name__, duration=duration):
+                Extension._instance = None
+                extension = sim_extension(get_helper_extension())
+
+                callbacks = CallbackTracker(extension)
+                extension.schedule(callback, timedelta(seconds=1))
+                with patch("dynatrace_extension.sdk.callback.timer", side_effect=[0, duration]):
+                    extension._scheduler.run(blocking=False)
+                    self.assertTrue(callbacks.wait_for(1))
+                sfm = extension._prepare_sfm_metrics()
+                expected_values = {
+                    "dsfm:datasource.python.threads": 0,
+                    "dsfm:datasource.python.execution.time": duration,
+                    "dsfm:datasource.python.execution.total.count": 1,
+                    "dsfm:datasource.python.execution.count": 1,
+                    "dsfm:datasource.python.execution.ok.count": ok_count,
+                    "dsfm:datasource.python.execution.timeout.count": timeout_count,
+                    "dsfm:datasource.python.execution.exception.count": exception_count,
+                }
+                self.verify_sfm_value(sfm, expected_values)
 
     def test_count_metric_registration(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
         metric_entry1 = CountMetricRegistrationEntry.make_list("metric_correct1", ["dim1", "dim2", "dim3"])
         metric_entry2 = CountMetricRegistrationEntry.make_all("metric_correct2")
@@ -590,88 +552,41 @@ class TestExtension(unittest.TestCase):
         extension._client.register_count_metrics.assert_called_with(pattern2)
 
     def test_send_dt_event(self):
-        extension = get_helper_extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
         extension.report_dt_event(
             DtEventType.CUSTOM_INFO, "test_event", 123456789, 123456789, 5, 'type("value")', {"prop1": "val1"}
         )
-        pattern = {
-            "eventType": "CUSTOM_INFO",
-            "title": "test_event",
-            "startTime": 123456789,
-            "endTime": 123456789,
-            "timeout": 5,
-            "entitySelector": 'type("value")',
-            "properties": {"prop1": "val1"},
-        }
-        extension._client.send_dt_event.assert_called_with(pattern)
+        extension._client.send_dt_event.assert_called_with(DT_EVENT)
 
     def test_send_dt_event_dict(self):
-        extension = get_helper_extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
-        valid_pattern = {
-            "eventType": "CUSTOM_INFO",
-            "title": "test_event",
-            "startTime": 123456789,
-            "endTime": 123456789,
-            "timeout": 5,
-            "entitySelector": 'type("value")',
-            "properties": {"prop1": "val1"},
-        }
-        invalid_pattern = {
-            "eventType": 134814814,
-            "title": "test_event",
-            "startTime": 123456789,
-            "endTime": 123456789,
-            "timeout": 5,
-            "entitySelector": 'type("value")',
-            "properties": {"prop1": 1},
-        }
-        extension.report_dt_event_dict(valid_pattern)
+        extension.report_dt_event_dict(DT_EVENT)
 
         try:
-            extension.report_dt_event_dict(invalid_pattern)
+            extension.report_dt_event_dict(INVALID_DT_EVENT)
         except Exception as e:
             expected = "Event type must be a DtEventType enum value, got: 134814814"
             self.assertEqual(str(e), expected)
-        extension._client.send_dt_event.assert_called_once_with(valid_pattern)
+        extension._client.send_dt_event.assert_called_once_with(DT_EVENT)
 
     def test_send_count_delta_signal_force_true(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
         metric_keys = ["metric1", "metric2", "metric3"]
         extension._send_count_delta_signal(metric_keys, force=True)
         extension._client.send_count_delta_signal.assert_called_once_with(metric_keys)
 
     def test_send_count_delta_signal_force_false(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
         metric_keys = {"metric1", "metric2", "metric3"}
         extension._send_count_delta_signal(metric_keys, force=False)
         self.assertEqual(metric_keys, extension._delta_signal_buffer)
 
     def test_send_count_delta_signal_force_true_and_false(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
         metric_keys = {"metric1", "metric2", "metric3"}
         extension._send_count_delta_signal(metric_keys, force=False)
@@ -739,19 +654,10 @@ class TestExtension(unittest.TestCase):
             MyExtension()
 
     def test_report_mint_and_log_sending_failure(self):
-        extension = get_helper_extension()
-        extension.extension_logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
+        extension = sim_extension(get_helper_extension())
 
-        extension._client.send_metrics.return_value = [
-            MintResponse(lines_invalid=1, lines_ok=0, error=None, warnings=None),
-            MintResponse(lines_invalid=2, lines_ok=0, error=None, warnings=None),
-        ]
-        extension._client.send_sfm_metrics.return_value = MintResponse(
-            lines_invalid=2, lines_ok=0, error=None, warnings=None
-        )
+        extension._client.send_metrics.return_value = [ONE_INVALID_LINE, TWO_INVALID_LINES]
+        extension._client.send_sfm_metrics.return_value = TWO_INVALID_LINES
         extension._client.send_events.return_value = {"error": {"message": "invalid log data"}}
 
         extension.report_metric("my:invalidmetric", 1)
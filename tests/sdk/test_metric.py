@@ -2,7 +2,9 @@ import unittest
 from datetime import datetime
 
 from dynatrace_extension import Metric, MetricType
-from dynatrace_extension.sdk.metric import SfmMetric
+from dynatrace_extension.sdk.metric import LIMIT_DIMENSIONS_COUNT, SfmMetric
+
+TOO_MANY_DIMENSIONS = {f"dim{i}": "value" for i in range(LIMIT_DIMENSIONS_COUNT + 1)}
 
 
 class TestMetric(unittest.TestCase):
@@ -24,8 +26,7 @@ class TestMetric(unittest.TestCase):
         self.assertEqual(metric.to_mint_line(), f"myMetric gauge,101 {int(timestamp.timestamp() * 1000)}")
 
     def test_too_many_dimensions(self):
-        dimensions = {k: "value" for k in range(0, 51)}
-        metric = Metric("myMetric", 101, dimensions=dimensions)
+        metric = Metric("myMetric", 101, dimensions=TOO_MANY_DIMENSIONS)
         self.assertRaises(ValueError, metric.validate)
 
     def test_line_too_large(self):
@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -6,16 +9,22 @@ from dynatrace_extension import Extension
 from dynatrace_extension.sdk.snapshot import Snapshot
 
 test_data_dir = Path(__file__).parent.parent / "data"
+SNAPSHOT_JSON = test_data_dir / "snapshot.json"
 
 
 class TestSnapshot(unittest.TestCase):
+    logger: MagicMock
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.logger = MagicMock()
+
     def test_extension_get_snapshot(self):
         extension = Extension()
-        extension.logger = MagicMock()
+        extension.logger = self.logger
         extension._running_in_sim = True
-        extension.initialize()
 
-        snapshot = extension.get_snapshot(test_data_dir / "snapshot.json")
+        snapshot = extension.get_snapshot(SNAPSHOT_JSON)
         self.assertIsNotNone(snapshot)
         assert snapshot.host_id == "HOST-524E3E2974F9AC2A"
         self.assertEqual(len(snapshot.entries), 24)
@@ -24,7 +33,7 @@ class TestSnapshot(unittest.TestCase):
         self.assertEqual(len(processes), 4)
 
     def test_snapshot_parsing(self):
-        snapshot = Snapshot.parse_from_file(test_data_dir / "snapshot.json")
+        snapshot = Snapshot.parse_from_file(SNAPSHOT_JSON)
         self.assertIsNotNone(snapshot)
         assert snapshot.host_id == "HOST-524E3E2974F9AC2A"
         self.assertEqual(len(snapshot.entries), 24)
@@ -46,3 +55,18 @@ class TestSnapshot(unittest.TestCase):
 
                     self.assertEqual(process.properties.port_bindings[0].ip, "127.0.0.1")
                     self.assertEqual(process.properties.port_bindings[0].port, 3128)
+
+    def test_snapshot_parsed_again_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_file = Path(tmp_dir) / "snapshot.json"
+            shutil.copy(SNAPSHOT_JSON, snapshot_file)
+
+            snapshot = Snapshot.parse_from_file(snapshot_file)
+            snapshot.entries.clear()
+            self.assertEqual(len(Snapshot.parse_from_file(snapshot_file).entries), 24)
+
+            snapshot_file.write_text('{"host_id": "0X0000000000000001", "entries": []}')
+            os.utime(snapshot_file, ns=(0, 0))
+            changed_snapshot = Snapshot.parse_from_file(snapshot_file)
+            self.assertEqual(changed_snapshot.host_id, "HOST-0000000000000001")
+            self.assertEqual(changed_snapshot.entries, [])
@@ -1,158 +1,120 @@
-import time
+import logging
 import unittest
 from datetime import timedelta
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
 from dynatrace_extension import Extension
 from dynatrace_extension.sdk.communication import DebugClient, MultiStatus
 from dynatrace_extension.sdk.extension import Status, StatusValue
+from tests.sdk.helpers import CallbackTracker
 
+# The tests do not inspect what the extensions log
+NULL_LOGGER = logging.getLogger("tests.sdk.test_status")
+NULL_LOGGER.addHandler(logging.NullHandler())
+NULL_LOGGER.propagate = False
 
-class TestStatus(unittest.TestCase):
-    def tearDown(self) -> None:
-        Extension._instance = None
 
-    def test_status(self):
-        status = Status(StatusValue.OK, "status message")
-        self.assertEqual(status.status, StatusValue.OK)
-        self.assertEqual(status.message, "status message")
-        self.assertEqual(status.status.value, "OK")
+def bad_method_1():
+    msg = "something went wrong"
+    raise Exception(msg)
 
-    def test_overall_status(self):
-        def callback():
-            return 1
 
-        ext = Extension()
-        ext.logger = MagicMock()
-        ext._running_in_sim = True
-        ext._client = DebugClient("", "", MagicMock())
-        ext._is_fastcheck = False
-        ext.schedule(callback, timedelta(seconds=1))
-        status = ext._build_current_status()
+def bad_method_2():
+    msg = "something broke"
+    raise Exception(msg)
 
-        self.assertEqual(status.status, StatusValue.OK)
-        self.assertEqual(status.message, "")
-
-    def test_bad_status(self):
-        ext = Extension()
-        ext.logger = MagicMock()
-        ext._running_in_sim = True
-        ext._client = DebugClient("", "", MagicMock())
-        ext._is_fastcheck = False
-
-        def bad_method():
-            msg = "something went wrong"
-            raise Exception(msg)
-
-        ext.schedule(bad_method, timedelta(seconds=1))
-        ext._scheduler.run(blocking=False)
-        time.sleep(0.01)
 
-        status = ext._build_current_status()
-        self.assertEqual(status.status, StatusValue.GENERIC_ERROR)
-        self.assertIn("something went wrong", status.message)
-
-    def test_multiple_bad_status(self):
-        ext = Extension()
-        ext.logger = MagicMock()
-        ext._running_in_sim = True
-        ext._client = DebugClient("", "", MagicMock())
-        ext._is_fastcheck = False
+def ok_status():
+    return Status(StatusValue.OK, "foo1")
 
-        def bad_method_1():
-            msg = "something went wrong"
-            raise Exception(msg)
 
-        def bad_method_2():
-            msg = "something broke"
-            raise Exception(msg)
+def empty_status():
+    return Status(StatusValue.EMPTY, "foo2")
 
-        ext.schedule(bad_method_1, timedelta(seconds=1))
-        ext.schedule(bad_method_2, timedelta(seconds=1))
-        ext._scheduler.run(blocking=False)
-        time.sleep(1)
 
-        status = ext._build_current_status()
-        self.assertEqual(status.status, StatusValue.GENERIC_ERROR)
-        self.assertIn("something went wrong", status.message)
-        self.assertIn("something broke", status.message)
+def multistatus():
+    ret = MultiStatus()
+    ret.add_status(StatusValue.OK, "foo1")
+    ret.add_status(StatusValue.UNKNOWN_ERROR, "foo2")
+    return ret
 
-    def test_callback_taking_too_long_sets_status(self):
-        extension = Extension()
-        extension.logger = MagicMock()
-        extension._running_in_sim = True
-        extension._is_fastcheck = False
-        extension._client = MagicMock()
 
-        def callback():
-            time.sleep(1)
+class TestStatus(unittest.TestCase):
+    client: DebugClient
 
-        extension.schedule(callback, timedelta(seconds=1))
-        extension._scheduler.run(blocking=False)
-        time.sleep(2)
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Not inspected by the tests, the debug client keeps no state after construction
+        cls.client = DebugClient("", "", NULL_LOGGER)
 
-        self.assertTrue(extension._scheduled_callbacks[1].status.is_error())
-        self.assertIn("longer than the interval", extension._scheduled_callbacks[1].status.message)
+    def tearDown(self) -> None:
+        Extension._instance = None
 
-    def test_direct_status_return(self):
+    def create_extension(self) -> Extension:
+        Extension._instance = None
         ext = Extension()
-        ext.logger = MagicMock()
+        ext.logger = NULL_LOGGER
         ext._running_in_sim = True
-        ext._client = DebugClient("", "", MagicMock())
+        ext._client = self.client
         ext._is_fastcheck = False
+        return ext
 
-        def callback():
-            return Status(StatusValue.OK, "foo1")
-
-        ext.schedule(callback, timedelta(seconds=1))
+    def run_scheduled_callbacks(self, ext: Extension) -> None:
+        """Run the callbacks that are due and wait until all of them finished."""
+        callbacks = CallbackTracker(ext)
         ext._scheduler.run(blocking=False)
-        time.sleep(0.01)
+        # Callbacks scheduled in the simulator are all due right away
+        self.assertTrue(callbacks.wait_for(len(ext._scheduled_callbacks)))
 
-        status = ext._build_current_status()
+    def test_status(self):
+        status = Status(StatusValue.OK, "status message")
         self.assertEqual(status.status, StatusValue.OK)
-        self.assertIn("foo1", status.message)
-
-    def test_direct_statuses_return(self):
+        self.assertEqual(status.message, "status message")
+        self.assertEqual(status.status.value, "OK")
 
+    def test_overall_status(self):
         def callback():
-            return Status(StatusValue.OK, "foo1")
-
-        def custom_query():
-            return Status(StatusValue.EMPTY, "foo2")
-
-        ext = Extension()
-        ext.logger = MagicMock()
-        ext._running_in_sim = True
-        ext._client = DebugClient("", "", MagicMock())
-        ext._is_fastcheck = False
+            return 1
 
+        ext = self.create_extension()
         ext.schedule(callback, timedelta(seconds=1))
-        ext.schedule(custom_query, timedelta(seconds=1))
-        ext._scheduler.run(blocking=False)
-        time.sleep(0.01)
-
         status = ext._build_current_status()
+
         self.assertEqual(status.status, StatusValue.OK)
-        self.assertIn("foo1", status.message)
-        self.assertIn("foo2", status.message)
+        self.assertEqual(status.message, "")
 
-    def test_multistatus(self):
-        ext = Extension()
-        ext.logger = MagicMock()
-        ext._running_in_sim = True
-        ext._client = DebugClient("", "", MagicMock())
-        ext._is_fastcheck = False
+    def test_callback_statuses(self):
+        cases = [
+            # scheduled callbacks, expected overall status, expected parts of the status message
+            ([bad_method_1], StatusValue.GENERIC_ERROR, ["something went wrong"]),
+            ([bad_method_1, bad_method_2], StatusValue.GENERIC_ERROR, ["something went wrong", "something broke"]),
+            ([ok_status], StatusValue.OK, ["foo1"]),
+            ([ok_status, empty_status], StatusValue.OK, ["foo1", "foo2"]),
+            ([multistatus], StatusValue.UNKNOWN_ERROR, ["foo1"]),
+        ]
+        for callbacks, expected_status, expected_messages in cases:
+            with self.subTest(callbacks=[callback.__name__ for callback in callbacks]):
+                ext = self.create_extension()
+                for callback in callbacks:
+                    ext.schedule(callback, timedelta(seconds=1))
+                self.run_scheduled_callbacks(ext)
+
+                status = ext._build_current_status()
+                self.assertEqual(status.status, expected_status)
+                for message in expected_messages:
+                    self.assertIn(message, status.message)
+
+    def test_callback_taking_too_long_sets_status(self):
+        # The callback moves the callback timer past its interval instead of sleeping
+        elapsed = [0.0]
 
         def callback():
-            ret = MultiStatus()
-            ret.add_status(StatusValue.OK, "foo1")
-            ret.add_status(StatusValue.UNKNOWN_ERROR, "foo2")
-            return ret
+            elapsed[0] += 1.5
 
+        ext = self.create_extension()
         ext.schedule(callback, timedelta(seconds=1))
-        ext._scheduler.run(blocking=False)
-        time.sleep(1)
+        with patch("dynatrace_extension.sdk.callback.timer", lambda: elapsed[0]):
+            self.run_scheduled_callbacks(ext)
 
-        status = ext._build_current_status()
-        self.assertEqual(status.status, StatusValue.UNKNOWN_ERROR)
-        self.assertIn("foo1", status.message)
+        self.assertTrue(ext._scheduled_callbacks[1].status.is_error())
+        self.assertIn("longer than the interval", ext._scheduled_callbacks[1].status.message)